@@ -1,6 +1,7 @@
 """Configuration for the LLM Council."""
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,16 +22,54 @@ CHAIRMAN_MODEL = "gemini-3-pro-preview"
 # Quick query model - for direct single-model responses
 QUICK_MODEL = "gemini-2.5-flash"
 
+# Retry settings for Stage 1 council queries
+STAGE1_RETRIES = 2  # Extra attempts per model after a transient failure (connect error, 429, 5xx)
+RETRY_BACKOFF_SECONDS = 0.5  # First backoff delay, doubled on each attempt
+
 # OpenRouter API endpoint
 OPENROUTER_BASE_URL = os.getenv("OPENAI_API_BASE_URL")
-OPENROUTER_API_URL = f"{OPENROUTER_BASE_URL}/chat/completions"
-OPENROUTER_RESPONSE_URL = f"{OPENROUTER_BASE_URL}/responses"
 
-# Data directory for conversation storage
+
+def _openrouter_url(path: str) -> str:
+    """Join an endpoint path onto the base URL, failing loudly if it is unset."""
+    if not OPENROUTER_BASE_URL:
+        raise RuntimeError("OPENAI_API_BASE_URL is not set")
+    return f"{OPENROUTER_BASE_URL}/{path}"
+
+
+@lru_cache(maxsize=None)
+def openrouter_api_url() -> str:
+    """Chat completions endpoint."""
+    return _openrouter_url("chat/completions")
+
+
+@lru_cache(maxsize=None)
+def openrouter_response_url() -> str:
+    """Responses API endpoint."""
+    return _openrouter_url("responses")
+
+
+@lru_cache(maxsize=None)
+def openrouter_embeddings_url() -> str:
+    """Embeddings endpoint."""
+    return _openrouter_url("embeddings")
+
+
+# Data directory for conversation storage (holds the SQLite database)
 DATA_DIR = "data/conversations"
+CONVERSATION_CACHE_SIZE = 256  # Parsed conversations kept in memory, least recently used evicted
+HISTORY_CACHE_SIZE = 1024  # Extracted conversation histories kept in memory
 
 # Conversation history settings
 CONVERSATION_HISTORY_LIMIT = 10  # Number of recent turns to include in full context
 CONVERSATION_SUMMARY_THRESHOLD = 20  # When to start summarizing older messages
 SUMMARIZATION_MODEL = "gemini-2.5-flash"  # Fast model for summarization
 SUMMARIZATION_FALLBACK_MODELS = ["openai/gpt-4o-mini", "anthropic/claude-haiku"]  # Backup models
+SUMMARY_CACHE_SIZE = 256  # Generated summaries kept in memory, keyed by the summarized messages
+
+# Response cache settings (Stage 1 and quick queries)
+LLM_CACHE_TTL = 3600  # Seconds a cached response stays valid
+LLM_CACHE_MAX_ENTRIES = 512  # Oldest entries are evicted beyond this
+LLM_CACHE_EMBEDDING_MODEL = None  # Semantic lookup model (e.g. "text-embedding-3-small"); None for exact-match only
+LLM_CACHE_SIMILARITY_THRESHOLD = 0.92  # Minimum cosine similarity for a semantic hit
+LLM_CACHE_CONTEXT_TURNS = 4  # Recent history turns a semantic hit must share
@@ -1,79 +1,40 @@
 """3-stage LLM Council orchestration."""
 
-from typing import List, Dict, Any, Tuple
-from .openrouter import query_models_parallel, query_model
-from .config import TITLE_MODEL, COUNCIL_MODELS, CHAIRMAN_MODEL
-
-
-async def stage1_collect_responses(user_query: str) -> List[Dict[str, Any]]:
-    """
-    Stage 1: Collect individual responses from all council models.
-
-    Args:
-        user_query: The user's question
-
-    Returns:
-        List of dicts with 'model', 'response', and additional metadata keys
-    """
-    messages = [{"role": "user", "content": user_query}]
-
-    # Query all models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
-
-    # Format results with full Response API metadata
-    stage1_results = []
-    for model, response in responses.items():
-        if response is not None:  # Only include successful responses
-            stage1_results.append({
-                "model": model,
-                "response": response.get('content', ''),
-                "response_id": response.get('id'),
-                "usage": response.get('usage', {}),
-                "finish_reason": response.get('finish_reason'),
-            })
-
-    return stage1_results
-
-
-async def stage2_collect_rankings(
-    user_query: str,
-    stage1_results: List[Dict[str, Any]]
-) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
-    """
-    Stage 2: Each model ranks the anonymized responses.
-
-    Args:
-        user_query: The original user query
-        stage1_results: Results from Stage 1
-
-    Returns:
-        Tuple of (rankings list, label_to_model mapping)
-    """
-    # Create anonymized labels for responses (Response A, Response B, etc.)
-    labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
-
-    # Create mapping from label to model name
-    label_to_model = {
-        f"Response {label}": result['model']
-        for label, result in zip(labels, stage1_results)
-    }
-
-    # Build the ranking prompt
-    responses_text = "\n\n".join([
-        f"Response {label}:\n{result['response']}"
-        for label, result in zip(labels, stage1_results)
-    ])
-
-    ranking_prompt = f"""You are evaluating different responses to the following question:
-
-Question: {user_query}
-
-Here are the responses from different models (anonymized):
-
-{responses_text}
+import asyncio
+import hashlib
+import io
+import re
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+from .openrouter import (
+    query_models_parallel_grouped,
+    query_models_stream,
+    query_model,
+    query_model_stream,
+)
+from .config import TITLE_MODEL, COUNCIL_MODELS, CHAIRMAN_MODEL, STAGE1_RETRIES
+
+# Ranking patterns, compiled once: numbered entries capture the label directly
+_NUMBERED_RE = re.compile(r'\d+\.\s*(Response [A-Z])')
+_LABEL_RE = re.compile(r'Response [A-Z]')
+_RANKING_MARKER = "FINAL RANKING:"
+
+# Anonymized response labels, A through Z (matching the [A-Z] ranking patterns)
+_LABELS = tuple(chr(65 + i) for i in range(26))
+
+# Display names for history roles; anything that isn't the user is the assistant
+_ROLE_MAP = {"user": "User"}
+
+# Fixed instruction blocks. Each sits at the very start of its prompt so that
+# every request shares the same leading tokens, which providers with prefix
+# caching can reuse across queries and turns; history and the query follow.
+_STAGE2_INSTRUCTIONS = """You are evaluating different responses to a user's question. The responses come from different models and are anonymized.
 
 Your task:
-1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly.
+1. First, evaluate each response individually. For each response, explain what it does well and what it does poorly, considering:
+   - Accuracy and factual correctness
+   - Insightfulness and depth
+   - Clarity and coherence
+   - Relevance to the question and to the conversation context, if any is provided
 2. Then, at the very end of your response, provide a final ranking.
 
 IMPORTANT: Your final ranking MUST be formatted EXACTLY as follows:
@@ -91,97 +52,22 @@ Response C offers the most comprehensive answer...
 FINAL RANKING:
 1. Response C
 2. Response A
-3. Response B
-
-Now provide your evaluation and ranking:"""
-
-    messages = [{"role": "user", "content": ranking_prompt}]
-
-    # Get rankings from all council models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
-
-    # Format results with full Response API metadata
-    stage2_results = []
-    for model, response in responses.items():
-        if response is not None:
-            full_text = response.get('content', '')
-            parsed = parse_ranking_from_text(full_text)
-            stage2_results.append({
-                "model": model,
-                "ranking": full_text,
-                "parsed_ranking": parsed,
-                "response_id": response.get('id'),
-                "usage": response.get('usage', {}),
-                "finish_reason": response.get('finish_reason'),
-            })
-
-    return stage2_results, label_to_model
-
-
-async def stage3_synthesize_final(
-    user_query: str,
-    stage1_results: List[Dict[str, Any]],
-    stage2_results: List[Dict[str, Any]]
-) -> Dict[str, Any]:
-    """
-    Stage 3: Chairman synthesizes final response.
-
-    Args:
-        user_query: The original user query
-        stage1_results: Individual model responses from Stage 1
-        stage2_results: Rankings from Stage 2
-
-    Returns:
-        Dict with 'model', 'response', and additional metadata keys
-    """
-    # Build comprehensive context for chairman
-    stage1_text = "\n\n".join([
-        f"Model: {result['model']}\nResponse: {result['response']}"
-        for result in stage1_results
-    ])
+3. Response B"""
 
-    stage2_text = "\n\n".join([
-        f"Model: {result['model']}\nRanking: {result['ranking']}"
-        for result in stage2_results
-    ])
+_STAGE3_INSTRUCTIONS = """You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
 
-    chairman_prompt = f"""You are the Chairman of an LLM Council. Multiple AI models have provided responses to a user's question, and then ranked each other's responses.
-
-Original Question: {user_query}
-
-STAGE 1 - Individual Responses:
-{stage1_text}
-
-STAGE 2 - Peer Rankings:
-{stage2_text}
-
-Your task as Chairman is to synthesize all of this information into a single, comprehensive, accurate answer to the user's original question. Consider:
+Your task as Chairman is to synthesize all of this information into a single, comprehensive, accurate answer to the user's current question. Consider:
 - The individual responses and their insights
 - The peer rankings and what they reveal about response quality
 - Any patterns of agreement or disagreement
+- The conversation history, if provided, so that your answer reads as a natural continuation of the conversation"""
 
-Provide a clear, well-reasoned final answer that represents the council's collective wisdom:"""
-
-    messages = [{"role": "user", "content": chairman_prompt}]
-
-    # Query the chairman model
-    response = await query_model(CHAIRMAN_MODEL, messages)
+_TITLE_PROMPT_TEMPLATE = """Generate a very short title (3-5 words maximum) that summarizes the following question.
+The title should be concise and descriptive. Do not use quotes or punctuation in the title.
 
-    if response is None:
-        # Fallback if chairman fails
-        return {
-            "model": CHAIRMAN_MODEL,
-            "response": "Error: Unable to generate final synthesis."
-        }
+Question: {user_query}
 
-    # Return with full Response API metadata
-    return {
-        "model": CHAIRMAN_MODEL,
-        "response": response.get('content', ''),
-        "response_id": response.get('id'),
-        "usage": response.get('usage', {}),
-        "finish_reason": response.get('finish_reason'),
-    }
+Title:"""
 
 
 def parse_ranking_from_text(ranking_text: str) -> List[str]:
@@ -194,70 +80,68 @@ def parse_ranking_from_text(ranking_text: str) -> List[str]:
     Returns:
         List of response labels in ranked order
     """
-    import re
+    # Every pattern below needs a "Response " label; bail out before any regex work
+    if "Response " not in ranking_text:
+        return []
 
-    # Look for "FINAL RANKING:" section
-    if "FINAL RANKING:" in ranking_text:
+    # Look for the last "FINAL RANKING:" marker; the ranking lives at the tail
+    marker_index = ranking_text.rfind(_RANKING_MARKER)
+    if marker_index != -1:
         # Extract everything after "FINAL RANKING:"
-        parts = ranking_text.split("FINAL RANKING:")
-        if len(parts) >= 2:
-            ranking_section = parts[1]
-            # Try to extract numbered list format (e.g., "1. Response A")
-            # This pattern looks for: number, period, optional space, "Response X"
-            numbered_matches = re.findall(r'\d+\.\s*Response [A-Z]', ranking_section)
-            if numbered_matches:
-                # Extract just the "Response X" part
-                return [re.search(r'Response [A-Z]', m).group() for m in numbered_matches]
-
-            # Fallback: Extract all "Response X" patterns in order
-            matches = re.findall(r'Response [A-Z]', ranking_section)
-            return matches
+        ranking_section = ranking_text[marker_index + len(_RANKING_MARKER):]
+        # Try to extract numbered list format (e.g., "1. Response A")
+        # This pattern looks for: number, period, optional space, "Response X"
+        # The capture group yields just the "Response X" part
+        numbered_matches = _NUMBERED_RE.findall(ranking_section)
+        if numbered_matches:
+            return numbered_matches
+
+        # Fallback: Extract all "Response X" patterns in order
+        return _LABEL_RE.findall(ranking_section)
 
     # Fallback: try to find any "Response X" patterns in order
-    matches = re.findall(r'Response [A-Z]', ranking_text)
-    return matches
+    return _LABEL_RE.findall(ranking_text)
 
 
 def calculate_aggregate_rankings(
     stage2_results: List[Dict[str, Any]],
-    label_to_model: Dict[str, str]
+    label_to_model: Dict[str, List[str]]
 ) -> List[Dict[str, Any]]:
     """
     Calculate aggregate rankings across all models.
 
     Args:
         stage2_results: Rankings from each model
-        label_to_model: Mapping from anonymous labels to model names
+        label_to_model: Mapping from anonymous labels to the models whose
+            (identical) response was shown under that label
 
     Returns:
         List of dicts with model name and average rank, sorted best to worst
     """
-    from collections import defaultdict
-
-    # Track positions for each model
-    model_positions = defaultdict(list)
+    # Track (count, position sum) for each model
+    totals: Dict[str, Tuple[int, int]] = {}
 
     for ranking in stage2_results:
-        ranking_text = ranking['ranking']
-
-        # Parse the ranking from the structured format
-        parsed_ranking = parse_ranking_from_text(ranking_text)
+        # Stage 2 already parsed the ranking; only re-parse results without it
+        parsed_ranking = ranking.get('parsed_ranking')
+        if parsed_ranking is None:
+            parsed_ranking = parse_ranking_from_text(ranking['ranking'])
 
         for position, label in enumerate(parsed_ranking, start=1):
-            if label in label_to_model:
-                model_name = label_to_model[label]
-                model_positions[model_name].append(position)
+            # A deduplicated label stands for several models; credit each of them
+            for model_name in label_to_model.get(label, ()):
+                count, position_sum = totals.get(model_name, (0, 0))
+                totals[model_name] = (count + 1, position_sum + position)
 
     # Calculate average position for each model
-    aggregate = []
-    for model, positions in model_positions.items():
-        if positions:
-            avg_rank = sum(positions) / len(positions)
-            aggregate.append({
-                "model": model,
-                "average_rank": round(avg_rank, 2),
-                "rankings_count": len(positions)
-            })
+    aggregate = [
+        {
+            "model": model,
+            "average_rank": round(position_sum / count, 2),
+            "rankings_count": count
+        }
+        for model, (count, position_sum) in totals.items()
+    ]
 
     # Sort by average rank (lower is better)
     aggregate.sort(key=lambda x: x['average_rank'])
@@ -275,12 +159,7 @@ async def generate_conversation_title(user_query: str) -> str:
     Returns:
         A short title (3-5 words)
     """
-    title_prompt = f"""Generate a very short title (3-5 words maximum) that summarizes the following question.
-The title should be concise and descriptive. Do not use quotes or punctuation in the title.
-
-Question: {user_query}
-
-Title:"""
+    title_prompt = _TITLE_PROMPT_TEMPLATE.format(user_query=user_query)
 
     messages = [{"role": "user", "content": title_prompt}]
 
@@ -317,46 +196,63 @@ Title:"""
                 return "New Conversation"
 
 
-async def run_full_council(user_query: str) -> Tuple[List, List, Dict, Dict]:
+async def run_full_council(
+    user_query: str,
+    include_title: bool = False
+) -> Tuple[List, List, Dict, Dict]:
     """
     Run the complete 3-stage council process.
 
     Args:
         user_query: The user's question
+        include_title: Also generate a conversation title, returned in metadata
 
     Returns:
         Tuple of (stage1_results, stage2_results, stage3_result, metadata)
     """
-    # Stage 1: Collect individual responses
-    stage1_results = await stage1_collect_responses(user_query)
+    return await run_full_council_with_history(user_query, None, include_title)
 
-    # If no models responded successfully, return error
-    if not stage1_results:
-        return [], [], {
-            "model": "error",
-            "response": "All models failed to respond. Please try again."
-        }, {}
 
-    # Stage 2: Collect rankings
-    stage2_results, label_to_model = await stage2_collect_rankings(user_query, stage1_results)
+def _write_history(
+    buf: io.StringIO,
+    conversation_history: List[Dict[str, Any]],
+    terminator: str
+):
+    """Write each history message to buf as "Role: content" followed by terminator."""
+    for msg in conversation_history:
+        buf.write(f"{_ROLE_MAP.get(msg['role'], 'Assistant')}: {msg['content']}{terminator}")
 
-    # Calculate aggregate rankings
-    aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
 
-    # Stage 3: Synthesize final answer
-    stage3_result = await stage3_synthesize_final(
-        user_query,
-        stage1_results,
-        stage2_results
-    )
+def _response_key(text: str) -> bytes:
+    """Hash a response with case and whitespace normalized, for duplicate detection."""
+    normalized = " ".join(text.split()).casefold()
+    return hashlib.blake2b(normalized.encode(), digest_size=8).digest()
 
-    # Prepare metadata
-    metadata = {
-        "label_to_model": label_to_model,
-        "aggregate_rankings": aggregate_rankings
-    }
 
-    return stage1_results, stage2_results, stage3_result, metadata
+def _group_responses(
+    stage1_results: List[Dict[str, Any]]
+) -> Dict[bytes, List[Dict[str, Any]]]:
+    """Group Stage 1 results whose responses are identical, in first-seen order."""
+    groups: Dict[bytes, List[Dict[str, Any]]] = {}
+    for result in stage1_results:
+        groups.setdefault(_response_key(result['response'] or ''), []).append(result)
+    return groups
+
+
+def is_single_answer(stage1_results: List[Dict[str, Any]]) -> bool:
+    """Whether Stage 1 produced exactly one distinct answer (one model, or all agreeing)."""
+    return len(_group_responses(stage1_results)) == 1
+
+
+def _format_anonymized_responses(
+    labels: Tuple[str, ...],
+    stage1_results: List[Dict[str, Any]]
+) -> str:
+    """Render Stage 1 responses under their anonymized labels for Stage 2."""
+    return "\n\n".join(
+        f"**Response {label}:**\n{result['response']}"
+        for label, result in zip(labels, stage1_results)
+    )
 
 
 async def stage1_collect_responses_with_history(
@@ -378,23 +274,23 @@ async def stage1_collect_responses_with_history(
 
     if conversation_history:
         # Add conversation context
-        context_text = "Previous conversation context:\n\n"
-        for msg in conversation_history:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            context_text += f"{role}: {msg['content']}\n\n"
-
-        context_text += f"Current question: {user_query}\n\nPlease provide your response considering the conversation history."
-        messages.append({"role": "user", "content": context_text})
+        buf = io.StringIO()
+        buf.write("Previous conversation context:\n\n")
+        _write_history(buf, conversation_history, "\n\n")
+        buf.write(f"Current question: {user_query}\n\nPlease provide your response considering the conversation history.")
+        messages.append({"role": "user", "content": buf.getvalue()})
     else:
         # No conversation history, use original format
         messages = [{"role": "user", "content": user_query}]
 
-    # Query all models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
-
-    # Format results with full Response API metadata
+    # Query all models in parallel, formatting each result as soon as it lands
+    # so Stage 2 can fire the moment the slowest model finishes
     stage1_results = []
-    for model, response in responses.items():
+    async for model, response in query_models_stream(
+        COUNCIL_MODELS, messages,
+        use_cache=True, cache_query=user_query, cache_history=conversation_history,
+        retries=STAGE1_RETRIES
+    ):
         if response is not None:  # Only include successful responses
             stage1_results.append({
                 "model": model,
@@ -404,6 +300,11 @@ async def stage1_collect_responses_with_history(
                 "finish_reason": response.get('finish_reason'),
             })
 
+    # Results arrive in completion order; restore the configured order so the
+    # anonymized labels and the Stage 1 tabs are the same on every run
+    model_order = {model: index for index, model in enumerate(COUNCIL_MODELS)}
+    stage1_results.sort(key=lambda result: model_order[result["model"]])
+
     return stage1_results
 
 
@@ -411,75 +312,60 @@ async def stage2_collect_rankings_with_history(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
     conversation_history: List[Dict[str, Any]] = None
-) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[str]]]:
     """
     Stage 2 with optional conversation history context.
 
+    Identical Stage 1 responses are shown to the rankers once, under a
+    single label shared by all the models that produced them.
+
     Args:
         user_query: The original user query
         stage1_results: Results from Stage 1
         conversation_history: List of previous conversation messages
 
     Returns:
-        Tuple of (rankings list, label_to_model mapping)
+        Tuple of (rankings list, label_to_model mapping of label to models)
     """
-    # Create anonymized labels for responses (Response A, Response B, etc.)
-    labels = [chr(65 + i) for i in range(len(stage1_results))]  # A, B, C, ...
-    label_to_model = {f"Response {label}": result["model"] for label, result in zip(labels, stage1_results)}
+    # Group identical responses so each distinct answer is ranked only once
+    groups = _group_responses(stage1_results)
 
-    # Build the ranking prompt with conversation context
-    prompt_parts = []
+    # Create anonymized labels for distinct responses (Response A, Response B, etc.)
+    labels = _LABELS[:len(groups)]  # A, B, C, ...
+    label_to_model = {
+        f"Response {label}": [result['model'] for result in group]
+        for label, group in zip(labels, groups.values())
+    }
+    representatives = [group[0] for group in groups.values()]
+
+    # Build the ranking prompt: fixed instructions first, then the variable tail
+    sections = [_STAGE2_INSTRUCTIONS]
 
     if conversation_history:
-        prompt_parts.append("Previous conversation context:")
-        for msg in conversation_history:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            prompt_parts.append(f"{role}: {msg['content']}")
-        prompt_parts.append("")
-
-    prompt_parts.extend([
-        f"Current question: {user_query}",
-        "",
-        "Here are the anonymized responses from the council members:",
-        ""
-    ])
+        buf = io.StringIO()
+        buf.write("Previous conversation context:\n")
+        _write_history(buf, conversation_history, "\n")
+        sections.append(buf.getvalue()[:-1])  # Sections are joined with their own separator
+
+    sections.append(
+        f"Question: {user_query}\n\n"
+        "Here are the responses from different models (anonymized):"
+    )
 
     # Add anonymized responses
-    for label, result in zip(labels, stage1_results):
-        prompt_parts.append(f"**Response {label}:**")
-        prompt_parts.append(result["response"])
-        prompt_parts.append("")
-
-    # Add evaluation instructions
-    prompt_parts.extend([
-        "Please evaluate each response based on:",
-        "1. Accuracy and factual correctness",
-        "2. Insightfulness and depth",
-        "3. Clarity and coherence",
-        "4. Relevance to the question and conversation context",
-        "",
-        "Consider the conversation context when evaluating responses.",
-        "",
-        "After evaluating each response, please provide a final ranking from best to worst.",
-        "",
-        "**FINAL RANKING:**",
-        "1. Response X (best)",
-        "2. Response Y",
-        "3. Response Z",
-        "... (worst)",
-        "",
-        "Do not include any text after the ranking section."
-    ])
-
-    # Join all parts into the final prompt
-    messages = [{"role": "user", "content": "\n".join(prompt_parts)}]
+    sections.append(_format_anonymized_responses(labels, representatives))
+
+    sections.append("Now provide your evaluation and ranking:")
+
+    # Join all sections into the final prompt
+    messages = [{"role": "user", "content": "\n\n".join(sections)}]
 
     # Query all models in parallel
-    responses = await query_models_parallel(COUNCIL_MODELS, messages)
+    responses = await query_models_parallel_grouped(COUNCIL_MODELS, messages)
 
     # Format results with full Response API metadata
     stage2_results = []
-    for model, response in responses.items():
+    for model, response in responses:
         if response is not None:
             parsed_ranking = parse_ranking_from_text(response.get('content', ''))
             stage2_results.append({
@@ -494,6 +380,44 @@ async def stage2_collect_rankings_with_history(
     return stage2_results, label_to_model
 
 
+def _build_stage3_messages(
+    user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    conversation_history: List[Dict[str, Any]] = None
+) -> List[Dict[str, str]]:
+    """Build the chairman prompt shared by the blocking and streaming Stage 3."""
+    # Build synthesis prompt with conversation context, writing each piece
+    # straight into one buffer since histories and responses can be long
+    buf = io.StringIO()
+
+    # Fixed chairman instructions first, then the variable tail
+    buf.write(_STAGE3_INSTRUCTIONS)
+    buf.write("\n\n")
+
+    if conversation_history:
+        buf.write("Conversation History:\n")
+        _write_history(buf, conversation_history, "\n")
+        buf.write("\n---\n\n")
+
+    buf.write(f"Question: {user_query}\n\n")
+
+    # Add individual model responses with attribution
+    buf.write("STAGE 1 - Individual Responses:\n")
+    for result in stage1_results:
+        buf.write(f"**{result['model']}:**\n{result['response']}\n\n")
+
+    # Add peer rankings
+    buf.write("STAGE 2 - Peer Rankings:\n")
+    for result in stage2_results:
+        buf.write(f"**{result['model']}:**\n{result['ranking']}\n\n")
+
+    buf.write("Provide a clear, well-reasoned final answer that represents the council's collective wisdom:")
+
+    # Create final prompt
+    return [{"role": "user", "content": buf.getvalue()}]
+
+
 async def stage3_synthesize_final_with_history(
     user_query: str,
     stage1_results: List[Dict[str, Any]],
@@ -501,7 +425,7 @@ async def stage3_synthesize_final_with_history(
     conversation_history: List[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
-    Stage 3 with conversation history context.
+    Stage 3 with optional conversation history context.
 
     Args:
         user_query: The user's question
@@ -512,63 +436,9 @@ async def stage3_synthesize_final_with_history(
     Returns:
         Dict with 'model' and 'response' keys
     """
-    # Build synthesis prompt with conversation context
-    prompt_parts = []
-
-    if conversation_history:
-        prompt_parts.append("Conversation History:")
-        for msg in conversation_history:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            prompt_parts.append(f"{role}: {msg['content']}")
-        prompt_parts.append("")
-        prompt_parts.append("---")
-
-    prompt_parts.extend([
-        "Current Exchange:",
-        f"Question: {user_query}",
-        "",
-        "STAGE 1 - Individual Responses:",
-    ])
-
-    # Add individual model responses with attribution
-    for result in stage1_results:
-        prompt_parts.append(f"**{result['model']}:**")
-        prompt_parts.append(result['response'])
-        prompt_parts.append("")
-
-    prompt_parts.extend([
-        "STAGE 2 - Peer Rankings:",
-    ])
-
-    # Add peer rankings
-    for result in stage2_results:
-        prompt_parts.append(f"**{result['model']}:**")
-        prompt_parts.append(result['ranking'])
-        prompt_parts.append("")
-
-    # Add synthesis instructions with conversation context
-    if conversation_history:
-        prompt_parts.extend([
-            "Please synthesize a comprehensive response to the current question that:",
-            "1. Considers the ongoing conversation context and flow",
-            "2. Integrates the best insights from the individual responses",
-            "3. Takes into account the peer evaluations",
-            "4. Provides a coherent, natural continuation of the conversation",
-            "",
-            "Your response should acknowledge the conversation history while providing a thorough answer to the current question."
-        ])
-    else:
-        prompt_parts.extend([
-            "Please synthesize a comprehensive response to the current question that:",
-            "1. Integrates the best insights from the individual responses",
-            "2. Takes into account the peer evaluations",
-            "3. Provides a clear, coherent answer",
-            "",
-            "Your response should reflect the collective wisdom of the council while addressing the user's question directly."
-        ])
-
-    # Create final prompt
-    messages = [{"role": "user", "content": "\n".join(prompt_parts)}]
+    messages = _build_stage3_messages(
+        user_query, stage1_results, stage2_results, conversation_history
+    )
 
     # Query chairman model
     response = await query_model(CHAIRMAN_MODEL, messages)
@@ -589,20 +459,125 @@ async def stage3_synthesize_final_with_history(
         }
 
 
-async def run_full_council_with_history(
+async def stage3_synthesize_final_stream(
     user_query: str,
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
     conversation_history: List[Dict[str, Any]] = None
-) -> Tuple[List, List, Dict, Dict]:
+) -> AsyncIterator[Dict[str, Any]]:
     """
-    Run the complete 3-stage council process with conversation history support.
+    Stage 3 with conversation history context, streaming the chairman's output.
 
     Args:
         user_query: The user's question
+        stage1_results: Results from Stage 1
+        stage2_results: Results from Stage 2
         conversation_history: List of previous conversation messages
 
+    Yields:
+        {'type': 'delta', 'content': str} for each chunk of generated text,
+        {'type': 'reset'} if the stream broke off and the text streamed so far
+        should be discarded, then a final {'type': 'result', 'data': dict}
+        with the same shape as stage3_synthesize_final_with_history returns
+    """
+    messages = _build_stage3_messages(
+        user_query, stage1_results, stage2_results, conversation_history
+    )
+
+    parts = []
+    result = {"model": CHAIRMAN_MODEL, "response_id": None, "usage": {}, "finish_reason": None}
+    failed = False
+
+    try:
+        async for chunk in query_model_stream(CHAIRMAN_MODEL, messages):
+            if chunk.get('error'):
+                # Providers report a mid-stream failure as an error chunk
+                # rather than by dropping the connection
+                print(f"Error streaming from chairman model {CHAIRMAN_MODEL}: {chunk['error']}")
+                failed = True
+                break
+
+            result["response_id"] = chunk.get('id') or result["response_id"]
+            if chunk.get('usage'):
+                result["usage"] = chunk['usage']
+
+            for choice in chunk.get('choices') or []:
+                if choice.get('finish_reason'):
+                    result["finish_reason"] = choice['finish_reason']
+                    if choice['finish_reason'] == 'error':
+                        failed = True
+                delta = (choice.get('delta') or {}).get('content')
+                if delta:
+                    parts.append(delta)
+                    yield {"type": "delta", "content": delta}
+
+            if failed:
+                print(f"Chairman model {CHAIRMAN_MODEL} finished its stream with an error")
+                break
+
+    except Exception as e:
+        print(f"Error streaming from chairman model {CHAIRMAN_MODEL}: {e}")
+        failed = True
+
+    if failed or not parts:
+        # The stream failed (possibly partway through) or produced nothing:
+        # fall back to a regular request rather than keep a truncated answer
+        if parts:
+            yield {"type": "reset"}
+        result = await stage3_synthesize_final_with_history(
+            user_query, stage1_results, stage2_results, conversation_history
+        )
+    else:
+        result["response"] = "".join(parts)
+
+    yield {"type": "result", "data": result}
+
+
+def single_response_outcome(
+    stage1_results: List[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build the Stage 3 result and metadata when Stage 1 has a single answer.
+
+    Whether one model responded or every model gave the same response,
+    ranking is trivially "Response A" and the chairman has nothing to
+    synthesize, so the answer is passed through as the final answer (every
+    model credited with rank 1) and Stages 2 and 3 are skipped.
+
+    Args:
+        stage1_results: Successful Stage 1 results, all with the same answer
+            (see is_single_answer)
+
     Returns:
-        Tuple of (stage1_results, stage2_results, stage3_result, metadata)
+        Tuple of (stage3_result, metadata)
     """
+    stage1_result = stage1_results[0]
+    models = [result['model'] for result in stage1_results]
+
+    stage3_result = {
+        "model": stage1_result['model'],
+        "response": stage1_result['response'],
+        "response_id": stage1_result.get('response_id'),
+        "usage": stage1_result.get('usage', {}),
+        "finish_reason": stage1_result.get('finish_reason'),
+    }
+
+    metadata = {
+        "label_to_model": {"Response A": models},
+        "aggregate_rankings": [
+            {"model": model, "average_rank": 1.0, "rankings_count": 0}
+            for model in models
+        ]
+    }
+
+    return stage3_result, metadata
+
+
+async def _run_council_stages(
+    user_query: str,
+    conversation_history: List[Dict[str, Any]] = None
+) -> Tuple[List, List, Dict, Dict]:
+    """Run Stages 1-3 for run_full_council_with_history (without the title)."""
     # Stage 1: Collect individual responses with history context
     stage1_results = await stage1_collect_responses_with_history(user_query, conversation_history)
 
@@ -613,6 +588,11 @@ async def run_full_council_with_history(
             "response": "All models failed to respond. Please try again."
         }, {}
 
+    # With a single distinct answer there is nothing to rank or synthesize
+    if is_single_answer(stage1_results):
+        stage3_result, metadata = single_response_outcome(stage1_results)
+        return stage1_results, [], stage3_result, metadata
+
     # Stage 2: Collect rankings with history context
     stage2_results, label_to_model = await stage2_collect_rankings_with_history(
         user_query, stage1_results, conversation_history
@@ -635,6 +615,48 @@ async def run_full_council_with_history(
     return stage1_results, stage2_results, stage3_result, metadata
 
 
+async def cancel_task(task: Optional[asyncio.Task]):
+    """Cancel a background task that is no longer wanted and collect its outcome."""
+    if task is None:
+        return
+    task.cancel()
+    # Retrieving the result keeps a failure from being reported as never retrieved
+    await asyncio.gather(task, return_exceptions=True)
+
+
+async def run_full_council_with_history(
+    user_query: str,
+    conversation_history: List[Dict[str, Any]] = None,
+    include_title: bool = False
+) -> Tuple[List, List, Dict, Dict]:
+    """
+    Run the complete 3-stage council process with conversation history support.
+
+    Args:
+        user_query: The user's question
+        conversation_history: List of previous conversation messages
+        include_title: Also generate a conversation title, returned in metadata
+
+    Returns:
+        Tuple of (stage1_results, stage2_results, stage3_result, metadata)
+    """
+    # The title only depends on the query, so run it alongside all three stages
+    title_task = asyncio.create_task(generate_conversation_title(user_query)) if include_title else None
+
+    try:
+        stage1_results, stage2_results, stage3_result, metadata = await _run_council_stages(
+            user_query, conversation_history
+        )
+    except BaseException:
+        await cancel_task(title_task)
+        raise
+
+    if title_task:
+        metadata["title"] = await title_task
+
+    return stage1_results, stage2_results, stage3_result, metadata
+
+
 async def quick_query(
     user_query: str,
     conversation_history: List[Dict[str, Any]] = None
@@ -656,19 +678,20 @@ async def quick_query(
 
     if conversation_history:
         # Add conversation context
-        context_text = "Previous conversation context:\n\n"
-        for msg in conversation_history:
-            role = "User" if msg["role"] == "user" else "Assistant"
-            context_text += f"{role}: {msg['content']}\n\n"
-
-        context_text += f"Current question: {user_query}"
-        messages.append({"role": "user", "content": context_text})
+        buf = io.StringIO()
+        buf.write("Previous conversation context:\n\n")
+        _write_history(buf, conversation_history, "\n\n")
+        buf.write(f"Current question: {user_query}")
+        messages.append({"role": "user", "content": buf.getvalue()})
     else:
         # No conversation history, use original format
         messages = [{"role": "user", "content": user_query}]
 
     # Query the quick model
-    response = await query_model(QUICK_MODEL, messages)
+    response = await query_model(
+        QUICK_MODEL, messages,
+        use_cache=True, cache_query=user_query, cache_history=conversation_history
+    )
 
     if response is None:
         return {
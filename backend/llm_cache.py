@@ -0,0 +1,210 @@
+"""In-memory response cache for LLM queries."""
+
+import asyncio
+import hashlib
+import math
+import operator
+import time
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional, Callable, Awaitable, Tuple
+
+import orjson
+
+def _normalize(vector: List[float]) -> Optional[List[float]]:
+    """Scale a vector to unit length so cosine similarity becomes a dot product."""
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return None
+    return [x / norm for x in vector]
+
+
+class LLMCache:
+    """
+    Two-tier cache for model responses.
+
+    The exact tier is keyed by a hash of (model, messages). The optional
+    semantic tier embeds the query text and returns the best cached response
+    for the same model whose cosine similarity clears the threshold. Each
+    semantic entry remembers the hash chain of the history turns it was
+    answered under and only matches queries asked under the same chain, so a
+    follow-up ("why?", "shorter please") is never answered from another
+    conversation, and a question with history never hits one asked without.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        similarity_threshold: float,
+        context_turns: int,
+        embed: Optional[Callable[[str], Awaitable[Optional[List[float]]]]] = None
+    ):
+        """
+        Args:
+            ttl: Seconds a cached response stays valid
+            max_entries: Maximum number of entries kept in each tier
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            context_turns: Recent history turns a semantic hit must share
+            embed: Async callable returning an embedding for a text, or None
+                to disable the semantic tier
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.context_turns = context_turns
+        self.embed = embed
+        self._exact: "OrderedDict[str, tuple]" = OrderedDict()
+        self._semantic: deque = deque(maxlen=max_entries)
+        # Embedding tasks keyed by text hash, shared by concurrent lookups
+        self._embeddings: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]]) -> str:
+        """Hash a (model, messages) pair into an exact-match key."""
+        payload = orjson.dumps({"model": model, "messages": messages}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+
+    @staticmethod
+    def prompt_text(messages: List[Dict[str, str]]) -> str:
+        """Text used for semantic lookup: the contents of all messages."""
+        return "\n\n".join(str(msg.get("content", "")) for msg in messages)
+
+    def context_chain(
+        self,
+        conversation_history: Optional[List[Dict[str, Any]]]
+    ) -> Tuple[str, ...]:
+        """Hash each of the most recent history turns into a comparable chain."""
+        if not conversation_history:
+            return ()
+        return tuple(
+            hashlib.sha256(f"{msg['role']}\0{msg['content']}".encode("utf-8")).hexdigest()
+            for msg in conversation_history[-self.context_turns:]
+        )
+
+    async def get(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        query_text: Optional[str] = None,
+        conversation_history: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            model: Model identifier
+            messages: Messages that would be sent to the model
+            query_text: Text matched semantically (defaults to the full prompt)
+            conversation_history: Prior turns the query was asked under
+
+        Returns:
+            Cached response dict, or None on a miss
+        """
+        now = time.monotonic()
+        key = self.make_key(model, messages)
+
+        entry = self._exact.get(key)
+        if entry is not None:
+            expires_at, response = entry
+            if expires_at > now:
+                self._exact.move_to_end(key)
+                return response
+            del self._exact[key]
+
+        if self.embed is None:
+            return None
+
+        if query_text is None:
+            query_text = self.prompt_text(messages)
+
+        vector = await self._embedding(query_text)
+        if vector is None:
+            return None
+
+        # Only answers given under the same recent turns are candidates
+        chain = self.context_chain(conversation_history)
+
+        best_score = self.similarity_threshold
+        best_response = None
+        for expires_at, entry_model, entry_vector, entry_chain, response in self._semantic:
+            if entry_model != model or expires_at <= now:
+                continue
+            if entry_chain != chain:
+                continue
+            score = sum(map(operator.mul, vector, entry_vector))
+            if score >= best_score:
+                best_score = score
+                best_response = response
+
+        return best_response
+
+    async def put(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        response: Dict[str, Any],
+        query_text: Optional[str] = None,
+        conversation_history: Optional[List[Dict[str, Any]]] = None
+    ):
+        """
+        Store a successful response in both tiers.
+
+        Args:
+            model: Model identifier
+            messages: Messages that were sent to the model
+            response: Response dict returned by the model
+            query_text: Text matched semantically (defaults to the full prompt)
+            conversation_history: Prior turns the query was asked under
+        """
+        expires_at = time.monotonic() + self.ttl
+        key = self.make_key(model, messages)
+
+        self._exact[key] = (expires_at, response)
+        self._exact.move_to_end(key)
+        while len(self._exact) > self.max_entries:
+            self._exact.popitem(last=False)
+
+        if self.embed is None:
+            return
+
+        if query_text is None:
+            query_text = self.prompt_text(messages)
+
+        vector = await self._embedding(query_text)
+        if vector is not None:
+            chain = self.context_chain(conversation_history)
+            self._semantic.append((expires_at, model, vector, chain, response))
+
+    def clear(self):
+        """Drop all cached responses and embeddings."""
+        self._exact.clear()
+        self._semantic.clear()
+        self._embeddings.clear()
+
+    async def _embedding(self, text: str) -> Optional[List[float]]:
+        """Embed a text once, sharing the in-flight request with concurrent callers."""
+        key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+        task = self._embeddings.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._embed_normalized(text))
+            self._embeddings[key] = task
+            while len(self._embeddings) > self.max_entries:
+                self._embeddings.popitem(last=False)
+
+        try:
+            vector = await asyncio.shield(task)
+        except Exception as e:
+            print(f"Embedding lookup failed: {e}")
+            vector = None
+
+        if vector is None and self._embeddings.get(key) is task:
+            # Don't remember a failure; the next lookup of this text retries
+            del self._embeddings[key]
+        return vector
+
+    async def _embed_normalized(self, text: str) -> Optional[List[float]]:
+        vector = await self.embed(text)
+        if not vector:
+            return None
+        return _normalize(vector)
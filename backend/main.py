@@ -2,17 +2,30 @@
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response
 from pydantic import BaseModel
 from typing import List, Dict, Any
+from contextlib import asynccontextmanager
 import uuid
-import json
 import asyncio
+import orjson
 
-from . import storage
-from .council import run_full_council_with_history, generate_conversation_title, stage1_collect_responses_with_history, stage2_collect_rankings_with_history, stage3_synthesize_final_with_history, calculate_aggregate_rankings, quick_query
+from . import storage, openrouter
+from .council import run_full_council_with_history, generate_conversation_title, stage1_collect_responses_with_history, stage2_collect_rankings_with_history, stage3_synthesize_final_stream, calculate_aggregate_rankings, single_response_outcome, is_single_answer, quick_query, cancel_task
 
-app = FastAPI(title="LLM Council API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Migrate old conversations on startup; close the database and HTTP client on shutdown."""
+    migrated = storage.migrate_legacy_conversations()
+    if migrated:
+        print(f"Migrated {migrated} conversations to the SQLite database")
+    yield
+    storage.close()
+    await openrouter.aclose()
+
+
+app = FastAPI(title="LLM Council API", lifespan=lifespan)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -24,6 +37,11 @@ app.add_middleware(
 )
 
 
+def _sse(event: Dict[str, Any]) -> str:
+    """Encode an event as a Server-Sent Events data line."""
+    return f"data: {orjson.dumps(event).decode()}\n\n"
+
+
 class CreateConversationRequest(BaseModel):
     """Request to create a new conversation."""
     pass
@@ -119,6 +137,21 @@ async def get_conversation(conversation_id: str):
     return conversation
 
 
+@app.get("/api/conversations/{conversation_id}/export")
+async def export_conversation(conversation_id: str):
+    """Download a conversation as pretty-printed JSON."""
+    try:
+        content = storage.export_pretty(conversation_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"Content-Disposition": f'attachment; filename="{conversation_id}.json"'}
+    )
+
+
 @app.delete("/api/conversations/{conversation_id}", status_code=204)
 async def delete_conversation(conversation_id: str):
     """
@@ -161,11 +194,6 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     # Add user message
     storage.add_user_message(conversation_id, request.content)
 
-    # If this is the first message, generate a title
-    if is_first_message:
-        title = await generate_conversation_title(request.content)
-        storage.update_conversation_title(conversation_id, title)
-
     # Get conversation history for context (only if not first message)
     conversation_history = None
     if not is_first_message:
@@ -176,10 +204,14 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
             conversation_history = await storage.build_conversation_context(raw_history)
 
     # Run the 3-stage council process with conversation history
+    # (on the first message the title is generated alongside the council stages)
     stage1_results, stage2_results, stage3_result, metadata = await run_full_council_with_history(
-        request.content, conversation_history
+        request.content, conversation_history, include_title=is_first_message
     )
 
+    if is_first_message:
+        storage.update_conversation_title(conversation_id, metadata.get("title", "New Conversation"))
+
     # Add assistant message with all stages
     storage.add_assistant_message(
         conversation_id,
@@ -213,10 +245,10 @@ async def send_quick_message(conversation_id: str, request: SendMessageRequest):
     # Add user message
     storage.add_user_message(conversation_id, request.content)
 
-    # If this is the first message, generate a title
+    # If this is the first message, generate a title alongside the quick query
+    title_task = None
     if is_first_message:
-        title = await generate_conversation_title(request.content)
-        storage.update_conversation_title(conversation_id, title)
+        title_task = asyncio.create_task(generate_conversation_title(request.content))
 
     # Get conversation history for context (only if not first message)
     conversation_history = None
@@ -226,7 +258,14 @@ async def send_quick_message(conversation_id: str, request: SendMessageRequest):
             conversation_history = await storage.build_conversation_context(raw_history)
 
     # Run quick query
-    quick_result = await quick_query(request.content, conversation_history)
+    try:
+        quick_result = await quick_query(request.content, conversation_history)
+    except BaseException:
+        await cancel_task(title_task)
+        raise
+
+    if title_task:
+        storage.update_conversation_title(conversation_id, await title_task)
 
     # Add assistant message (quick responses are stored in stage3 for consistency)
     storage.add_assistant_message(
@@ -257,6 +296,7 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
     is_first_message = len(conversation["messages"]) == 0
 
     async def event_generator():
+        title_task = None
         try:
             # Add user message
             storage.add_user_message(conversation_id, request.content)
@@ -271,31 +311,45 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
                     conversation_history = await storage.build_conversation_context(raw_history)
 
             # Start title generation in parallel (don't await yet)
-            title_task = None
             if is_first_message:
                 title_task = asyncio.create_task(generate_conversation_title(request.content))
 
             # Stage 1: Collect responses with history context
-            yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
+            yield _sse({'type': 'stage1_start'})
             stage1_results = await stage1_collect_responses_with_history(request.content, conversation_history)
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
-
-            # Stage 2: Collect rankings with history context
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
-            stage2_results, label_to_model = await stage2_collect_rankings_with_history(request.content, stage1_results, conversation_history)
-            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
-
-            # Stage 3: Synthesize final answer with history context
-            yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
-            stage3_result = await stage3_synthesize_final_with_history(request.content, stage1_results, stage2_results, conversation_history)
-            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
+            yield _sse({'type': 'stage1_complete', 'data': stage1_results})
+
+            if is_single_answer(stage1_results):
+                # A single distinct answer has nothing to rank or synthesize: pass it through
+                stage2_results = []
+                stage3_result, metadata = single_response_outcome(stage1_results)
+                yield _sse({'type': 'stage2_complete', 'data': stage2_results, 'metadata': metadata})
+                yield _sse({'type': 'stage3_complete', 'data': stage3_result})
+            else:
+                # Stage 2: Collect rankings with history context
+                yield _sse({'type': 'stage2_start'})
+                stage2_results, label_to_model = await stage2_collect_rankings_with_history(request.content, stage1_results, conversation_history)
+                aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
+                yield _sse({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})
+
+                # Stage 3: Synthesize final answer with history context
+                yield _sse({'type': 'stage3_start'})
+                stage3_result = None
+                async for event in stage3_synthesize_final_stream(request.content, stage1_results, stage2_results, conversation_history):
+                    if event['type'] == 'delta':
+                        yield _sse({'type': 'stage3_delta', 'delta': event['content']})
+                    elif event['type'] == 'reset':
+                        yield _sse({'type': 'stage3_reset'})
+                    else:
+                        stage3_result = event['data']
+                yield _sse({'type': 'stage3_complete', 'data': stage3_result})
 
             # Wait for title generation if it was started
             if title_task:
                 title = await title_task
+                title_task = None
                 storage.update_conversation_title(conversation_id, title)
-                yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
+                yield _sse({'type': 'title_complete', 'data': {'title': title}})
 
             # Save complete assistant message
             storage.add_assistant_message(
@@ -306,11 +360,15 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
             )
 
             # Send completion event
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+            yield _sse({'type': 'complete'})
 
         except Exception as e:
             # Send error event
-            yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+            yield _sse({'type': 'error', 'message': str(e)})
+
+        finally:
+            # A failed stage or a disconnected client leaves the title unused
+            await cancel_task(title_task)
 
     return StreamingResponse(
         event_generator(),
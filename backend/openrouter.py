@@ -1,14 +1,181 @@
 """OpenRouter API client for making LLM requests."""
 
+import asyncio
 import httpx
-from typing import List, Dict, Any, Optional
-from .config import OPENROUTER_API_KEY, OPENROUTER_API_URL
+import orjson
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+from .config import (
+    OPENROUTER_API_KEY,
+    openrouter_api_url,
+    openrouter_embeddings_url,
+    LLM_CACHE_TTL,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_EMBEDDING_MODEL,
+    LLM_CACHE_SIMILARITY_THRESHOLD,
+    LLM_CACHE_CONTEXT_TURNS,
+    RETRY_BACKOFF_SECONDS,
+)
+from .llm_cache import LLMCache
+
+
+# One client for every request, so connections (and their TLS sessions) are
+# pooled and reused instead of being set up per call. Created on first use
+# inside the running event loop; timeouts are given per request.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient()
+    return _client
+
+
+async def aclose():
+    """Close the shared HTTP client (call on shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def embed_text(text: str, timeout: float = 30.0) -> Optional[List[float]]:
+    """
+    Embed a text with the configured cache embedding model.
+
+    Args:
+        text: Text to embed
+        timeout: Request timeout in seconds
+
+    Returns:
+        Embedding vector, or None if failed
+    """
+    headers = {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+    payload = {
+        "model": LLM_CACHE_EMBEDDING_MODEL,
+        "input": text,
+    }
+
+    try:
+        response = await _get_client().post(
+            openrouter_embeddings_url(),
+            headers=headers,
+            content=orjson.dumps(payload),
+            timeout=timeout
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)['data'][0]['embedding']
+
+    except Exception as e:
+        print(f"Error embedding text with {LLM_CACHE_EMBEDDING_MODEL}: {e}")
+        return None
+
+
+# Shared response cache, consulted only by callers that pass use_cache=True
+response_cache = LLMCache(
+    ttl=LLM_CACHE_TTL,
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    similarity_threshold=LLM_CACHE_SIMILARITY_THRESHOLD,
+    context_turns=LLM_CACHE_CONTEXT_TURNS,
+    embed=embed_text if LLM_CACHE_EMBEDDING_MODEL else None,
+)
+
+
+def _format_choice(data: Dict[str, Any], choice: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the full OpenAI Response API format with metadata for one choice."""
+    message = choice['message']
+    content = message.get('content')
+
+    return {
+        'id': data.get('id'),
+        'object': data.get('object'),
+        'created': data.get('created'),
+        'model': data.get('model'),
+        'content': content,
+        'reasoning_details': message.get('reasoning_details'),
+        'finish_reason': choice.get('finish_reason'),
+        'usage': data.get('usage', {}),
+        'system_fingerprint': data.get('system_fingerprint'),
+        # Backward compatibility alias
+        'response': content
+    }
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a failed request is worth retrying."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    # The request never reached the model; a read timeout is not included, as
+    # retrying a hung model would only hold the council up for another timeout
+    return isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout))
+
+
+async def _query_model_attempt(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0,
+    use_cache: bool = False,
+    cache_query: Optional[str] = None,
+    cache_history: Optional[List[Dict[str, Any]]] = None
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    Query a single model once, reporting whether a failure is transient.
+
+    Returns:
+        Tuple of (response dict or None if failed, whether the failure is
+        worth retrying: a connection error, 429 or 5xx)
+    """
+    if use_cache:
+        cached = await response_cache.get(model, messages, cache_query, cache_history)
+        if cached is not None:
+            return cached, False
+
+    headers = {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+    payload = {
+        "model": model,
+        "messages": messages,
+    }
+
+    try:
+        response = await _get_client().post(
+            openrouter_api_url(),
+            headers=headers,
+            content=orjson.dumps(payload),
+            timeout=timeout
+        )
+        response.raise_for_status()
+
+        data = orjson.loads(response.content)
+        result = _format_choice(data, data['choices'][0])
+        content = result['content']
+
+    except Exception as e:
+        print(f"Error querying model {model}: {e}")
+        return None, _is_transient(e)
+
+    if use_cache and content:
+        await response_cache.put(model, messages, result, cache_query, cache_history)
+
+    return result, False
 
 
 async def query_model(
     model: str,
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    use_cache: bool = False,
+    cache_query: Optional[str] = None,
+    cache_history: Optional[List[Dict[str, Any]]] = None
 ) -> Optional[Dict[str, Any]]:
     """
     Query a single model via OpenRouter API.
@@ -17,10 +184,125 @@ async def query_model(
         model: OpenRouter model identifier (e.g., "openai/gpt-4o")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        use_cache: Serve from and populate the shared response cache
+        cache_query: Query text the cache matches semantically (defaults to the prompt)
+        cache_history: Prior turns the cached answer depends on
 
     Returns:
         Response dict with 'content' and optional 'reasoning_details', or None if failed
     """
+    response, _ = await _query_model_attempt(
+        model, messages, timeout,
+        use_cache=use_cache, cache_query=cache_query, cache_history=cache_history
+    )
+    return response
+
+
+async def query_model_with_retry(
+    model: str,
+    messages: List[Dict[str, str]],
+    retries: int,
+    **kwargs: Any
+) -> Optional[Dict[str, Any]]:
+    """
+    Query a single model, retrying transient failures with exponential backoff.
+
+    Only connection errors, 429 and 5xx responses are retried. Timeouts and
+    other errors (a bad model id or key) would fail the same way again, so
+    they end the attempts at once and never add to the time Stage 1 waits.
+
+    Args:
+        model: OpenRouter model identifier
+        messages: List of message dicts with 'role' and 'content'
+        retries: Number of extra attempts after the first failure
+        **kwargs: Passed through to query_model
+
+    Returns:
+        Response dict from the first successful attempt, or None if all failed
+    """
+    for attempt in range(retries + 1):
+        response, transient = await _query_model_attempt(model, messages, **kwargs)
+        if response is not None or not transient:
+            return response
+
+        if attempt < retries:
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS * 2 ** attempt)
+
+    return None
+
+
+async def query_model_stream(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Query a single model with streaming enabled.
+
+    Args:
+        model: OpenRouter model identifier
+        messages: List of message dicts with 'role' and 'content'
+        timeout: Request timeout in seconds
+
+    Yields:
+        Parsed chat.completion.chunk dicts as the server sends them
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    headers = {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+    payload = {
+        "model": model,
+        "messages": messages,
+        "stream": True,
+    }
+
+    async with _get_client().stream(
+        "POST",
+        openrouter_api_url(),
+        headers=headers,
+        content=orjson.dumps(payload),
+        timeout=timeout
+    ) as response:
+        response.raise_for_status()
+
+        async for line in response.aiter_lines():
+            # Skip blank separators and SSE comments (keep-alive pings)
+            if not line.startswith("data:"):
+                continue
+
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+
+            yield orjson.loads(data)
+
+
+async def query_model_samples(
+    model: str,
+    messages: List[Dict[str, str]],
+    n: int,
+    timeout: float = 120.0
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Draw n completions of the same prompt from one model in a single request.
+
+    Providers that ignore the 'n' parameter return fewer choices; the missing
+    samples are then fetched with individual requests.
+
+    Args:
+        model: OpenRouter model identifier
+        messages: List of message dicts with 'role' and 'content'
+        n: Number of completions to draw
+        timeout: Request timeout in seconds
+
+    Returns:
+        List of n response dicts (None for failed samples)
+    """
     headers = {
         "Authorization": f"Bearer {OPENROUTER_API_KEY}",
         "Content-Type": "application/json",
@@ -29,65 +311,99 @@ async def query_model(
     payload = {
         "model": model,
         "messages": messages,
+        "n": n,
     }
 
+    results: List[Optional[Dict[str, Any]]] = []
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                OPENROUTER_API_URL,
-                headers=headers,
-                json=payload
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            message = data['choices'][0]['message']
-            choice = data['choices'][0]
-            content = message.get('content')
-
-            # Return full OpenAI Response API format with metadata
-            result = {
-                'id': data.get('id'),
-                'object': data.get('object'),
-                'created': data.get('created'),
-                'model': data.get('model'),
-                'content': content,
-                'reasoning_details': message.get('reasoning_details'),
-                'finish_reason': choice.get('finish_reason'),
-                'usage': data.get('usage', {}),
-                'system_fingerprint': data.get('system_fingerprint'),
-                # Backward compatibility alias
-                'response': content
-            }
-
-            return result
+        response = await _get_client().post(
+            openrouter_api_url(),
+            headers=headers,
+            content=orjson.dumps(payload),
+            timeout=timeout
+        )
+        response.raise_for_status()
+
+        data = orjson.loads(response.content)
+        results = [_format_choice(data, choice) for choice in data['choices'][:n]]
 
     except Exception as e:
-        print(f"Error querying model {model}: {e}")
-        return None
+        print(f"Error sampling {n} completions from model {model}: {e}")
+
+    if len(results) < n:
+        results.extend(await asyncio.gather(*[
+            query_model(model, messages, timeout=timeout)
+            for _ in range(n - len(results))
+        ]))
+
+    return results
 
 
-async def query_models_parallel(
+async def query_models_stream(
     models: List[str],
-    messages: List[Dict[str, str]]
-) -> Dict[str, Optional[Dict[str, Any]]]:
+    messages: List[Dict[str, str]],
+    use_cache: bool = False,
+    cache_query: Optional[str] = None,
+    cache_history: Optional[List[Dict[str, Any]]] = None,
+    retries: int = 0
+) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
     """
-    Query multiple models in parallel.
+    Query multiple models in parallel, yielding each result as it completes.
 
     Args:
         models: List of OpenRouter model identifiers
         messages: List of message dicts to send to each model
+        use_cache: Serve from and populate the shared response cache
+        cache_query: Query text the cache matches semantically (defaults to the prompt)
+        cache_history: Prior turns the cached answers depend on
+        retries: Extra attempts per failed model, each on that model's own task
+
+    Yields:
+        Tuples of (model identifier, response dict or None if failed),
+        in completion order
+    """
+    async def tagged(model: str) -> Tuple[str, Optional[Dict[str, Any]]]:
+        return model, await query_model_with_retry(
+            model, messages, retries,
+            use_cache=use_cache, cache_query=cache_query, cache_history=cache_history
+        )
+
+    for next_done in asyncio.as_completed([tagged(model) for model in models]):
+        yield await next_done
+
+
+async def query_models_parallel_grouped(
+    models: List[str],
+    messages: List[Dict[str, str]]
+) -> List[Tuple[str, Optional[Dict[str, Any]]]]:
+    """
+    Query multiple models in parallel with one request per distinct model.
+
+    When the same model appears several times, its completions are drawn with
+    a single n>1 request instead of one request each. Distinct models cannot
+    share a request and are queried in parallel as usual.
+
+    Args:
+        models: List of OpenRouter model identifiers (may repeat)
+        messages: List of message dicts to send to each model
 
     Returns:
-        Dict mapping model identifier to response dict (or None if failed)
+        List of (model identifier, response dict or None) pairs, one per
+        entry in models, grouped by model in first-seen order
     """
-    import asyncio
+    counts: Dict[str, int] = {}
+    for model in models:
+        counts[model] = counts.get(model, 0) + 1
 
-    # Create tasks for all models
-    tasks = [query_model(model, messages) for model in models]
+    async def run(model: str, n: int) -> List[Optional[Dict[str, Any]]]:
+        if n == 1:
+            return [await query_model(model, messages)]
+        return await query_model_samples(model, messages, n)
 
-    # Wait for all to complete
-    responses = await asyncio.gather(*tasks)
+    grouped = await asyncio.gather(*[run(model, n) for model, n in counts.items()])
 
-    # Map models to their responses
-    return {model: response for model, response in zip(models, responses)}
+    return [
+        (model, response)
+        for model, responses in zip(counts, grouped)
+        for response in responses
+    ]
@@ -1,11 +1,262 @@
-"""JSON-based storage for conversations."""
+"""SQLite storage for conversations."""
 
-import json
+import hashlib
 import os
-from datetime import datetime
-from typing import List, Dict, Any, Optional
+import sqlite3
+import struct
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Sequence
 from pathlib import Path
-from .config import DATA_DIR
+import orjson
+import ormsgpack
+from .config import (
+    DATA_DIR,
+    CONVERSATION_CACHE_SIZE,
+    HISTORY_CACHE_SIZE,
+    SUMMARY_CACHE_SIZE,
+)
+
+# Data directory with a trailing separator, so file paths are one concatenation
+_DATA_DIR_PREFIX = os.path.join(DATA_DIR, "")
+
+# All conversations live in one SQLite database: a row per conversation
+# (created_at being Unix nanoseconds; the API sees it as an ISO 8601 string)
+# and a row per message. A message row holds the whole message as MessagePack
+# in `body`, plus just what history building reads in `role` and `content`
+# (the content of an assistant message being its Stage 3 response), so history
+# comes back without decoding the Stage 1 and Stage 2 payloads. Adding a
+# message is a single INSERT.
+_DB_FILENAME = "conversations.db"
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    created_at INTEGER NOT NULL,
+    title TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    conv_id TEXT NOT NULL REFERENCES conversations(id) ON DELETE CASCADE,
+    role TEXT NOT NULL,
+    content TEXT,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS messages_conv_id ON messages(conv_id, id);
+"""
+
+# One connection shared by every thread, opened lazily. It runs in autocommit
+# mode; multi-statement writes open their own transaction under the lock.
+_db: Optional[sqlite3.Connection] = None
+_db_lock = threading.RLock()
+
+# The last list_conversations result, as (PRAGMA data_version, listing).
+# Writes through this module drop it; data_version changes when another
+# connection commits, so the listing is only re-queried after a change.
+_listing_cache: Optional[Tuple[int, List[Dict[str, Any]]]] = None
+
+# Older versions kept each conversation in its own file: whole-conversation
+# JSON (.json) or MessagePack (.msgpack), and later an append-only log (.log)
+# of length-prefixed MessagePack records with a .history projection and a
+# conversations.index beside it. These are only read to migrate them.
+_LOG_SUFFIX = ".log"
+_HISTORY_SUFFIX = ".history"
+_INDEX_FILENAME = "conversations.index"
+_FRAME = struct.Struct(">I")
+
+# Parsed conversations keyed by id, least recently used first. Writes through
+# this module keep the cached copy in step with the database; commits from
+# other connections (another worker or process) change PRAGMA data_version,
+# and the conversation and history caches are dropped when it moves.
+_conversation_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_conversation_cache_lock = threading.Lock()
+_cache_data_version: Optional[int] = None
+
+# Extracted histories keyed by (id, message count, limit), least recently used
+# first. Messages are only ever appended, so a changed count is a new key and
+# stale entries simply age out. Histories are tuples, so one cached instance
+# can be handed to every caller without copying.
+_history_cache: "OrderedDict[Tuple[str, int, Optional[int]], Tuple[Dict[str, Any], ...]]" = OrderedDict()
+_history_cache_lock = threading.Lock()
+
+# LLM summaries keyed by a hash of the messages they summarize, least recently
+# used first. The older part of a conversation is the same window on every
+# turn until it grows, so the summary is only generated once per window.
+_summary_cache: "OrderedDict[bytes, str]" = OrderedDict()
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _format_timestamp(created_at: Any) -> str:
+    """Render a stored Unix-ns timestamp as the ISO 8601 string the API returns."""
+    if isinstance(created_at, str):
+        return created_at  # Conversations migrated with a non-ISO timestamp
+
+    seconds, nanoseconds = divmod(created_at, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(
+        microsecond=nanoseconds // 1000
+    ).isoformat()
+
+
+def _parse_timestamp(created_at: str) -> Any:
+    """Convert an ISO 8601 timestamp back to Unix nanoseconds for storage (other strings are kept as-is)."""
+    try:
+        parsed = datetime.fromisoformat(created_at)
+    except ValueError:
+        return created_at
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)  # Older versions stored naive UTC
+    delta = parsed - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+def _decode_records(data: bytes) -> List[Dict[str, Any]]:
+    """Decode the records of a legacy log, leaving out a record torn by an interrupted append."""
+    records = []
+    offset = 0
+    end = len(data)
+    while offset + _FRAME.size <= end:
+        (length,) = _FRAME.unpack_from(data, offset)
+        start = offset + _FRAME.size
+        if start + length > end:
+            break
+        records.append(ormsgpack.unpackb(data[start:start + length]))
+        offset = start + length
+    return records
+
+
+def _replay(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rebuild a conversation dict from legacy log records."""
+    header = records[0]
+    conversation = {
+        "id": header["id"],
+        "created_at": _format_timestamp(header["created_at"]),
+        "title": header.get("title", "New Conversation"),
+        "messages": []
+    }
+
+    for record in records[1:]:
+        if record["type"] == "message":
+            conversation["messages"].append(record["message"])
+        elif record["type"] == "title":
+            conversation["title"] = record["title"]
+
+    return conversation
+
+
+def _history_content(message: Dict[str, Any]) -> Optional[str]:
+    """The text history building uses for a message."""
+    if message["role"] == "user":
+        return message["content"]
+
+    stage3 = message.get("stage3")
+    return stage3["response"] if stage3 and "response" in stage3 else None
+
+
+def _message_row(conversation_id: str, message: Dict[str, Any]) -> Tuple[str, str, Optional[str], bytes]:
+    """Column values for inserting a message."""
+    return (conversation_id, message["role"], _history_content(message), ormsgpack.packb(message))
+
+
+def _cache_get(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """Return the cached conversation, if any."""
+    with _conversation_cache_lock:
+        conversation = _conversation_cache.get(conversation_id)
+        if conversation is not None:
+            _conversation_cache.move_to_end(conversation_id)
+        return conversation
+
+
+def _cache_put(conversation_id: str, conversation: Dict[str, Any]):
+    """Cache a parsed conversation, evicting the least recently used beyond the cap."""
+    with _conversation_cache_lock:
+        _conversation_cache[conversation_id] = conversation
+        _conversation_cache.move_to_end(conversation_id)
+        while len(_conversation_cache) > CONVERSATION_CACHE_SIZE:
+            _conversation_cache.popitem(last=False)
+
+
+def _cache_discard(conversation_id: str):
+    """Drop a conversation and any histories extracted from it from the caches."""
+    with _conversation_cache_lock:
+        _conversation_cache.pop(conversation_id, None)
+
+    # History keys only change with the message count, so a rewritten or
+    # deleted (and re-created) conversation could otherwise hit a stale entry
+    with _history_cache_lock:
+        for key in [key for key in _history_cache if key[0] == conversation_id]:
+            del _history_cache[key]
+
+
+def _revalidate_caches(db: sqlite3.Connection):
+    """Drop cached conversations and histories if another connection has committed since. Caller holds _db_lock."""
+    global _cache_data_version
+    (data_version,) = db.execute("PRAGMA data_version").fetchone()
+    if data_version != _cache_data_version:
+        with _conversation_cache_lock:
+            _conversation_cache.clear()
+        with _history_cache_lock:
+            _history_cache.clear()
+        _cache_data_version = data_version
+
+
+def _connection() -> sqlite3.Connection:
+    """Return the shared connection, opening the database on first use. Caller holds _db_lock."""
+    global _db
+    if _db is None:
+        db = sqlite3.connect(
+            _DATA_DIR_PREFIX + _DB_FILENAME,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        # WAL lets reads proceed during a write and turns each commit into a
+        # sequential append; with it, NORMAL only syncs at checkpoints
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("PRAGMA foreign_keys=ON")
+        db.executescript(_SCHEMA)
+        _db = db
+    return _db
+
+
+def _write(sql: str, params: Tuple[Any, ...]) -> sqlite3.Cursor:
+    """Execute a single-statement write."""
+    global _listing_cache
+    with _db_lock:
+        cursor = _connection().execute(sql, params)
+        _listing_cache = None
+    return cursor
+
+
+@contextmanager
+def _transaction() -> Iterator[sqlite3.Connection]:
+    """Run several statements as one atomic write."""
+    global _listing_cache
+    with _db_lock:
+        db = _connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+        _listing_cache = None
+
+
+def close():
+    """Close the database connection (call on shutdown)."""
+    global _db, _listing_cache
+    with _db_lock:
+        if _db is not None:
+            _db.close()
+            _db = None
+        _listing_cache = None
 
 
 def ensure_data_dir():
@@ -13,9 +264,55 @@ def ensure_data_dir():
     Path(DATA_DIR).mkdir(parents=True, exist_ok=True)
 
 
-def get_conversation_path(conversation_id: str) -> str:
-    """Get the file path for a conversation."""
-    return os.path.join(DATA_DIR, f"{conversation_id}.json")
+# Create the directory once at import instead of on every write
+ensure_data_dir()
+
+
+def _remove_if_exists(path: str):
+    """Delete a file, ignoring one that is already gone."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def migrate_legacy_conversations() -> int:
+    """
+    Import conversations saved by older versions into the database.
+
+    Handles whole-conversation JSON (.json) and MessagePack (.msgpack) files
+    and append-only logs (.log). Each file is removed once imported.
+
+    Returns:
+        Number of conversations migrated
+    """
+    def load_log(data: bytes) -> Optional[Dict[str, Any]]:
+        records = _decode_records(data)
+        return _replay(records) if records else None
+
+    migrated = 0
+    with os.scandir(DATA_DIR) as it:
+        entries = [entry for entry in it if entry.is_file(follow_symlinks=False)]
+
+    loaders = {'.json': orjson.loads, '.msgpack': ormsgpack.unpackb, _LOG_SUFFIX: load_log}
+    for entry in entries:
+        stem, suffix = os.path.splitext(entry.name)
+        loads = loaders.get(suffix)
+        if loads is None:
+            continue
+
+        with open(entry.path, 'rb') as f:
+            conversation = loads(f.read())
+
+        if conversation is not None:
+            save_conversation(conversation)
+            migrated += 1
+        os.remove(entry.path)
+        if suffix == _LOG_SUFFIX:
+            _remove_if_exists(_DATA_DIR_PREFIX + stem + _HISTORY_SUFFIX)
+
+    _remove_if_exists(_DATA_DIR_PREFIX + _INDEX_FILENAME)
+    return migrated
 
 
 def create_conversation(conversation_id: str) -> Dict[str, Any]:
@@ -28,20 +325,20 @@ def create_conversation(conversation_id: str) -> Dict[str, Any]:
     Returns:
         New conversation dict
     """
-    ensure_data_dir()
-
+    created_at = time.time_ns()
     conversation = {
         "id": conversation_id,
-        "created_at": datetime.utcnow().isoformat(),
+        "created_at": _format_timestamp(created_at),
         "title": "New Conversation",
         "messages": []
     }
 
-    # Save to file
-    path = get_conversation_path(conversation_id)
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
+    _write(
+        "INSERT INTO conversations(id, created_at, title) VALUES (?, ?, ?)",
+        (conversation_id, created_at, conversation["title"])
+    )
 
+    _cache_put(conversation_id, conversation)
     return conversation
 
 
@@ -55,27 +352,91 @@ def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
     Returns:
         Conversation dict or None if not found
     """
-    path = get_conversation_path(conversation_id)
+    with _db_lock:
+        db = _connection()
+        _revalidate_caches(db)
+
+        conversation = _cache_get(conversation_id)
+        if conversation is not None:
+            return conversation
+
+        row = db.execute(
+            "SELECT created_at, title FROM conversations WHERE id = ?",
+            (conversation_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        bodies = db.execute(
+            "SELECT body FROM messages WHERE conv_id = ? ORDER BY id",
+            (conversation_id,)
+        ).fetchall()
 
-    if not os.path.exists(path):
-        return None
+    conversation = {
+        "id": conversation_id,
+        "created_at": _format_timestamp(row[0]),
+        "title": row[1],
+        "messages": [ormsgpack.unpackb(body) for (body,) in bodies]
+    }
 
-    with open(path, 'r') as f:
-        return json.load(f)
+    _cache_put(conversation_id, conversation)
+    return conversation
 
 
 def save_conversation(conversation: Dict[str, Any]):
     """
-    Save a conversation to storage.
+    Save a conversation to storage, replacing any stored copy.
 
     Args:
         conversation: Conversation dict to save
     """
-    ensure_data_dir()
+    conversation_id = conversation["id"]
+    created_at = _parse_timestamp(conversation["created_at"])
+    title = conversation.get("title", "New Conversation")
+    _cache_discard(conversation_id)
+
+    with _transaction() as db:
+        db.execute(
+            "INSERT INTO conversations(id, created_at, title) VALUES (?, ?, ?)"
+            " ON CONFLICT(id) DO UPDATE SET created_at = excluded.created_at, title = excluded.title",
+            (conversation_id, created_at, title)
+        )
+        db.execute("DELETE FROM messages WHERE conv_id = ?", (conversation_id,))
+        db.executemany(
+            "INSERT INTO messages(conv_id, role, content, body) VALUES (?, ?, ?, ?)",
+            [_message_row(conversation_id, message) for message in conversation["messages"]]
+        )
+
+    # Cache what get_conversation would read back (e.g. a migrated naive
+    # timestamp gains its "+00:00"), not the caller's dict as given
+    _cache_put(conversation_id, {
+        "id": conversation_id,
+        "created_at": _format_timestamp(created_at),
+        "title": title,
+        "messages": list(conversation["messages"])
+    })
 
-    path = get_conversation_path(conversation['id'])
-    with open(path, 'w') as f:
-        json.dump(conversation, f, indent=2)
+
+def export_pretty(conversation_id: str) -> bytes:
+    """
+    Export a conversation as indented, human-readable JSON.
+
+    Storage itself stays compact binary; this is for people reading or
+    archiving a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+
+    Returns:
+        UTF-8 encoded JSON document
+
+    Raises:
+        ValueError: If conversation doesn't exist
+    """
+    conversation = get_conversation(conversation_id)
+    if conversation is None:
+        raise ValueError(f"Conversation {conversation_id} not found")
+
+    return orjson.dumps(conversation, option=orjson.OPT_INDENT_2)
 
 
 def list_conversations() -> List[Dict[str, Any]]:
@@ -83,28 +444,56 @@ def list_conversations() -> List[Dict[str, Any]]:
     List all conversations (metadata only).
 
     Returns:
-        List of conversation metadata dicts
+        List of conversation metadata dicts; the list is cached and shared
+        between calls until the next write, so callers must not modify it
     """
-    ensure_data_dir()
-
-    conversations = []
-    for filename in os.listdir(DATA_DIR):
-        if filename.endswith('.json'):
-            path = os.path.join(DATA_DIR, filename)
-            with open(path, 'r') as f:
-                data = json.load(f)
-                # Return metadata only
-                conversations.append({
-                    "id": data["id"],
-                    "created_at": data["created_at"],
-                    "title": data.get("title", "New Conversation"),
-                    "message_count": len(data["messages"])
-                })
+    global _listing_cache
+    with _db_lock:
+        db = _connection()
+        (data_version,) = db.execute("PRAGMA data_version").fetchone()
+        if _listing_cache is not None and _listing_cache[0] == data_version:
+            return _listing_cache[1]
+
+        # One query, newest first, comparing integer timestamps; message
+        # bodies are never read
+        rows = db.execute(
+            "SELECT c.id, c.created_at, c.title,"
+            " (SELECT COUNT(*) FROM messages m WHERE m.conv_id = c.id)"
+            " FROM conversations c ORDER BY c.created_at DESC"
+        ).fetchall()
+
+        listing = [
+            {
+                "id": conversation_id,
+                "created_at": _format_timestamp(created_at),
+                "title": title,
+                "message_count": message_count
+            }
+            for conversation_id, created_at, title, message_count in rows
+        ]
+        _listing_cache = (data_version, listing)
+
+    return listing
+
+
+def _append_message(conversation_id: str, message: Dict[str, Any]):
+    """
+    Insert a message at the end of a conversation.
 
-    # Sort by creation time, newest first
-    conversations.sort(key=lambda x: x["created_at"], reverse=True)
+    Raises:
+        ValueError: If conversation doesn't exist
+    """
+    try:
+        _write(
+            "INSERT INTO messages(conv_id, role, content, body) VALUES (?, ?, ?, ?)",
+            _message_row(conversation_id, message)
+        )
+    except sqlite3.IntegrityError:
+        raise ValueError(f"Conversation {conversation_id} not found")
 
-    return conversations
+    conversation = _cache_get(conversation_id)
+    if conversation is not None:
+        conversation["messages"].append(message)
 
 
 def add_user_message(conversation_id: str, content: str):
@@ -115,17 +504,11 @@ def add_user_message(conversation_id: str, content: str):
         conversation_id: Conversation identifier
         content: User message content
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
-
-    conversation["messages"].append({
+    _append_message(conversation_id, {
         "role": "user",
         "content": content
     })
 
-    save_conversation(conversation)
-
 
 def add_assistant_message(
     conversation_id: str,
@@ -142,19 +525,13 @@ def add_assistant_message(
         stage2: List of model rankings
         stage3: Final synthesized response
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        raise ValueError(f"Conversation {conversation_id} not found")
-
-    conversation["messages"].append({
+    _append_message(conversation_id, {
         "role": "assistant",
         "stage1": stage1,
         "stage2": stage2,
         "stage3": stage3
     })
 
-    save_conversation(conversation)
-
 
 def update_conversation_title(conversation_id: str, title: str):
     """
@@ -164,85 +541,109 @@ def update_conversation_title(conversation_id: str, title: str):
         conversation_id: Conversation identifier
         title: New title for the conversation
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
+    cursor = _write(
+        "UPDATE conversations SET title = ? WHERE id = ?",
+        (title, conversation_id)
+    )
+    if cursor.rowcount == 0:
         raise ValueError(f"Conversation {conversation_id} not found")
 
-    conversation["title"] = title
-    save_conversation(conversation)
+    conversation = _cache_get(conversation_id)
+    if conversation is not None:
+        conversation["title"] = title
 
 
 def get_conversation_history(
     conversation_id: str,
     limit: Optional[int] = None
-) -> List[Dict[str, Any]]:
+) -> Tuple[Dict[str, Any], ...]:
     """
     Extract conversation history for context building.
 
     Args:
         conversation_id: Conversation identifier
-        limit: Maximum number of complete exchanges to extract
+        limit: Maximum number of most recent exchanges to extract
 
     Returns:
-        List of conversation messages (user + assistant stage3 only)
+        Immutable tuple of conversation messages (user + assistant stage3 only)
     """
-    conversation = get_conversation(conversation_id)
-    if conversation is None:
-        return []
-
+    with _db_lock:
+        db = _connection()
+        _revalidate_caches(db)
+        (count,) = db.execute(
+            "SELECT COUNT(*) FROM messages WHERE conv_id = ?",
+            (conversation_id,)
+        ).fetchone()
+
+        cache_key = (conversation_id, count, limit)
+        with _history_cache_lock:
+            cached = _history_cache.get(cache_key)
+            if cached is not None:
+                _history_cache.move_to_end(cache_key)
+                return cached
+
+        messages = [
+            {"role": role, "content": content}
+            for role, content in db.execute(
+                "SELECT role, content FROM messages WHERE conv_id = ? ORDER BY id",
+                (conversation_id,)
+            )
+        ]
+
+    # An exchange starts at a user message; with a limit, only the last
+    # `limit` of them matter, so find where they begin from the tail
+    start = 0
+    if limit:
+        seen = 0
+        for index in range(len(messages) - 1, -1, -1):
+            if messages[index]["role"] == "user":
+                seen += 1
+                if seen == limit:
+                    start = index
+                    break
+
+    # Extract exchanges (user + following assistant stage3) in one forward
+    # pass; rows already have the {'role', 'content'} shape
     history_messages = []
-    messages = conversation.get("messages", [])
-
-    # Extract complete exchanges (user + assistant stage3)
-    i = 0
-    exchange_count = 0
-
-    while i < len(messages):
-        message = messages[i]
+    append = history_messages.append
+    after_user = False
 
+    for message in islice(messages, start, None):
         if message["role"] == "user":
-            # Add user message
-            history_messages.append({
-                "role": "user",
-                "content": message["content"]
-            })
-
-            # Check if next message is an assistant with stage3
-            if i + 1 < len(messages) and messages[i + 1]["role"] == "assistant":
-                assistant_msg = messages[i + 1]
-                if "stage3" in assistant_msg and "response" in assistant_msg["stage3"]:
-                    history_messages.append({
-                        "role": "assistant",
-                        "content": assistant_msg["stage3"]["response"]
-                    })
-                    i += 1  # Skip the assistant message
+            append(message)
+            after_user = True
+        else:
+            if after_user and message["content"] is not None:
+                append(message)
+            after_user = False
 
-            exchange_count += 1
+    history = tuple(history_messages)
 
-            # Stop if we've reached the requested limit
-            if limit and exchange_count >= limit:
-                break
+    with _history_cache_lock:
+        _history_cache[cache_key] = history
+        while len(_history_cache) > HISTORY_CACHE_SIZE:
+            _history_cache.popitem(last=False)
 
-        i += 1
-
-    return history_messages
+    return history
 
 
 async def build_conversation_context(
-    conversation_history: List[Dict[str, Any]],
+    conversation_history: Sequence[Dict[str, Any]],
     limit: Optional[int] = None,
     summarize_older: bool = True
-) -> List[Dict[str, Any]]:
+) -> Sequence[Dict[str, Any]]:
     """
     Build context for LLM from conversation history.
 
     Args:
-        conversation_history: List of conversation messages
+        conversation_history: Conversation messages, as returned by
+            get_conversation_history
         limit: Maximum number of recent exchanges to include in full context
         summarize_older: Whether to summarize older messages
 
     Returns:
-        List of context messages for LLM consumption
+        Context messages for LLM consumption; a history that already fits is
+        returned as the same object
     """
     from .config import (
         CONVERSATION_HISTORY_LIMIT
@@ -253,7 +654,8 @@ async def build_conversation_context(
         limit = CONVERSATION_HISTORY_LIMIT
 
     if len(conversation_history) <= limit * 2:  # *2 for user+assistant pairs
-        # All messages fit in limit, return as-is
+        # All messages fit in limit: hand back the (immutable, possibly
+        # cached) history itself rather than a copy
         return conversation_history
 
     if not summarize_older:
@@ -307,16 +709,26 @@ async def summarize_conversation_segment(
     from .config import SUMMARIZATION_MODEL, SUMMARIZATION_FALLBACK_MODELS
     from .openrouter import query_model
 
+    cache_key = hashlib.blake2b(orjson.dumps(messages), digest_size=16).digest()
+    cached = _summary_cache.get(cache_key)
+    if cached is not None:
+        _summary_cache.move_to_end(cache_key)
+        return cached
+
     # Build conversation text for summarization (limit to avoid token limits)
-    conversation_text = ""
+    parts = []
+    total_chars = 0
     max_chars = 8000  # Limit characters to avoid hitting model token limits
 
     for msg in messages:
         role = "User" if msg["role"] == "user" else "Assistant"
         text = f"{role}: {msg['content']}\n\n"
-        if len(conversation_text) + len(text) > max_chars:
+        if total_chars + len(text) > max_chars:
             break
-        conversation_text += text
+        parts.append(text)
+        total_chars += len(text)
+
+    conversation_text = "".join(parts)
 
     # Create summarization prompt as a message
     summarization_prompt = f"""Please summarize the following conversation in a concise way that preserves the key points and maintains the conversation flow:
@@ -346,6 +758,9 @@ Please keep the summary under 300 words."""
             if response and response.get("content"):
                 summary = response["content"].strip()
                 print(f"Successfully generated summary using {model}: {summary[:100]}...")
+                _summary_cache[cache_key] = summary
+                while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+                    _summary_cache.popitem(last=False)
                 return summary
             else:
                 print(f"Empty or invalid response from model {model}. Response: {response}")
@@ -380,15 +795,17 @@ def delete_conversation(conversation_id: str) -> bool:
 
     Raises:
         ValueError: If conversation doesn't exist
-        OSError: If file deletion fails
     """
-    path = get_conversation_path(conversation_id)
-
-    if not os.path.exists(path):
+    # A single DELETE both checks for the conversation and removes it (its
+    # messages go with it through ON DELETE CASCADE); there is no separate
+    # existence query to race against
+    cursor = _write(
+        "DELETE FROM conversations WHERE id = ?",
+        (conversation_id,)
+    )
+    if cursor.rowcount == 0:
         raise ValueError(f"Conversation {conversation_id} not found")
 
-    try:
-        os.remove(path)
-        return True
-    except OSError as e:
-        raise OSError(f"Failed to delete conversation {conversation_id}: {str(e)}")
+    _cache_discard(conversation_id)
+
+    return True
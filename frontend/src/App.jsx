@@ -300,6 +300,31 @@ function App() {
             });
             break;
 
+          case 'stage3_delta':
+            // Render the chairman's answer progressively as tokens arrive
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              lastMsg.stage3 = {
+                model: lastMsg.stage3?.model || '',
+                response: (lastMsg.stage3?.response || '') + event.delta,
+              };
+              lastMsg.loading.stage3 = false;
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'stage3_reset':
+            // The stream broke off; drop the partial text until the full answer arrives
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = messages[messages.length - 1];
+              lastMsg.stage3 = null;
+              lastMsg.loading.stage3 = true;
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage3_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
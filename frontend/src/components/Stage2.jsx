@@ -43,14 +43,18 @@ const CopyButton = ({ content, onCopy }) => {
   );
 };
 
+// A label maps to every model that gave that (identical) response
+function labelModelNames(models) {
+  return [].concat(models).map((model) => model.split('/')[1] || model).join(' / ');
+}
+
 function deAnonymizeText(text, labelToModel) {
   if (!labelToModel) return text;
 
   let result = text;
-  // Replace each "Response X" with the actual model name
-  Object.entries(labelToModel).forEach(([label, model]) => {
-    const modelShortName = model.split('/')[1] || model;
-    result = result.replace(new RegExp(label, 'g'), `**${modelShortName}**`);
+  // Replace each "Response X" with the actual model name(s)
+  Object.entries(labelToModel).forEach(([label, models]) => {
+    result = result.replace(new RegExp(label, 'g'), `**${labelModelNames(models)}**`);
   });
   return result;
 }
@@ -115,7 +119,7 @@ function Stage2({ rankings, labelToModel, aggregateRankings, hasContext = false
               {rankings[activeTab].parsed_ranking.map((label, i) => (
                 <li key={i}>
                   {labelToModel && labelToModel[label]
-                    ? labelToModel[label].split('/')[1] || labelToModel[label]
+                    ? labelModelNames(labelToModel[label])
                     : label}
                 </li>
               ))}